@@ -11,6 +11,7 @@ This script:
 """
 
 import requests
+import random
 import time
 import json
 from datetime import datetime
@@ -19,6 +20,17 @@ from datetime import datetime
 BAILEYS_URL = "http://localhost:8081"
 GO_URL = "http://localhost:8080"
 
+# Polled repeatedly while waiting for the sync, so built once
+BAILEYS_SYNC_STATUS_URL = f"{BAILEYS_URL}/api/sync/status"
+
+# Shared by all bridge requests so repeated polls reuse the same connections
+session = requests.Session()
+
+# Sync status polling backoff (seconds)
+POLL_INTERVAL_INITIAL = 0.25
+POLL_INTERVAL_MAX = 5.0
+POLL_BACKOFF_FACTOR = 1.6
+
 def print_status(message, level="INFO"):
     """Print formatted status message."""
     timestamp = datetime.now().strftime("%H:%M:%S")
@@ -31,14 +43,14 @@ def check_bridge_health():
     print_status("Checking bridge health...")
 
     try:
-        go_health = requests.get(f"{GO_URL}/health", timeout=5).json()
+        go_health = session.get(f"{GO_URL}/health", timeout=5).json()
         print_status(f"✓ Go Bridge: {go_health['status']}", "SUCCESS")
     except Exception as e:
         print_status(f"✗ Go Bridge not responding: {e}", "ERROR")
         return False
 
     try:
-        baileys_health = requests.get(f"{BAILEYS_URL}/health", timeout=5).json()
+        baileys_health = session.get(f"{BAILEYS_URL}/health", timeout=5).json()
         print_status(f"✓ Baileys Bridge: {baileys_health.get('status', 'ok')}", "SUCCESS")
         print_status(f"  Connected: {baileys_health.get('connected', False)}", "INFO")
     except Exception as e:
@@ -50,7 +62,7 @@ def check_bridge_health():
 def get_baileys_sync_status():
     """Get current Baileys sync status."""
     try:
-        response = requests.get(f"{BAILEYS_URL}/api/sync/status", timeout=10)
+        response = session.get(BAILEYS_SYNC_STATUS_URL, timeout=10)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
@@ -60,7 +72,7 @@ def get_baileys_sync_status():
 def get_baileys_messages():
     """Get all messages from Baileys temp database."""
     try:
-        response = requests.get(f"{BAILEYS_URL}/api/messages", timeout=30)
+        response = session.get(f"{BAILEYS_URL}/api/messages", timeout=30)
         if response.status_code == 200:
             data = response.json()
             if data.get('success'):
@@ -84,12 +96,12 @@ def get_go_stats():
     """Get current message statistics from Go database."""
     try:
         # Try the stats endpoint
-        response = requests.get(f"{GO_URL}/api/stats", timeout=10)
+        response = session.get(f"{GO_URL}/api/stats", timeout=10)
         if response.status_code == 200:
             return response.json()
 
         # Fallback: count from unread chats endpoint
-        response = requests.get(f"{GO_URL}/api/chats/unread?limit=1", timeout=10)
+        response = session.get(f"{GO_URL}/api/chats/unread?limit=1", timeout=10)
         if response.status_code == 200:
             data = response.json()
             return {
@@ -100,6 +112,11 @@ def get_go_stats():
         print_status(f"Could not get Go stats: {e}", "WARN")
     return None
 
+def wait_before_next_poll(poll_interval):
+    """Sleep for the current poll interval plus jitter and return the next, backed-off interval."""
+    time.sleep(poll_interval + random.random() * 0.1)
+    return min(POLL_INTERVAL_MAX, poll_interval * POLL_BACKOFF_FACTOR)
+
 def wait_for_sync_completion(max_wait_minutes=15):
     """Wait for Baileys history sync to complete."""
     print_status("=" * 70)
@@ -112,6 +129,7 @@ def wait_for_sync_completion(max_wait_minutes=15):
     max_wait_seconds = max_wait_minutes * 60
     last_progress = -1
     last_message_count = 0
+    poll_interval = POLL_INTERVAL_INITIAL
 
     while True:
         elapsed = time.time() - start_time
@@ -123,7 +141,7 @@ def wait_for_sync_completion(max_wait_minutes=15):
         status = get_baileys_sync_status()
         if not status:
             print_status("Could not get sync status", "ERROR")
-            time.sleep(5)
+            poll_interval = wait_before_next_poll(poll_interval)
             continue
 
         is_syncing = status.get('is_syncing', False)
@@ -146,7 +164,7 @@ def wait_for_sync_completion(max_wait_minutes=15):
             print_status(f"  Total chats synced: {chats_synced:,}", "SUCCESS")
             return True
 
-        time.sleep(3)
+        poll_interval = wait_before_next_poll(poll_interval)
 
 def main():
     """Main execution flow."""
@@ -172,6 +190,7 @@ def main():
 
     # Check current status
     baileys_status = get_baileys_sync_status()
+    already_synced = False
     if baileys_status:
         print_status("Current Baileys Status:", "INFO")
         print_status(f"  Is syncing: {baileys_status.get('is_syncing', False)}", "INFO")
@@ -180,15 +199,16 @@ def main():
         print_status(f"  Progress: {baileys_status.get('progress_percent', 0)}%", "INFO")
         print_status(f"  Is latest: {baileys_status.get('is_latest', False)}", "INFO")
 
-        if baileys_status.get('is_latest') and not baileys_status.get('is_syncing'):
+        already_synced = baileys_status.get('is_latest') and not baileys_status.get('is_syncing')
+        if already_synced:
             print_status("", "SUCCESS")
             print_status("✓ History sync already completed!", "SUCCESS")
             print_status("", "INFO")
         else:
             print_status("", "INFO")
 
-    # Wait for sync to complete
-    if not wait_for_sync_completion(max_wait_minutes=15):
+    # Wait for sync to complete, unless it already is
+    if not already_synced and not wait_for_sync_completion(max_wait_minutes=15):
         print_status("", "WARN")
         print_status("Sync did not complete in time. You can:", "WARN")
         print_status("  1. Wait longer and run this script again", "WARN")
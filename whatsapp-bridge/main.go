@@ -5,15 +5,18 @@ import (
 	"database/sql"
 	"encoding/binary"
 	"encoding/json"
+	"errors"
 	"fmt"
 	"math"
 	"math/rand"
+	"net"
 	"net/http"
 	"os"
 	"os/signal"
 	"path/filepath"
 	"reflect"
 	"strings"
+	"sync"
 	"syscall"
 	"time"
 
@@ -84,15 +87,155 @@ func NewMessageStore() (*MessageStore, error) {
 			PRIMARY KEY (id, chat_jid),
 			FOREIGN KEY (chat_jid) REFERENCES chats(jid)
 		);
+
+		-- Newest-first listing, within a chat and across all chats, seeks these instead of sorting
+		CREATE INDEX IF NOT EXISTS idx_messages_chat_timestamp ON messages (chat_jid, timestamp);
+		CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages (timestamp);
+
+		CREATE TABLE IF NOT EXISTS sync_checkpoints (
+			chat_jid TEXT PRIMARY KEY,
+			page_cursor TEXT,
+			last_applied_index INTEGER,
+			last_message_id TEXT,
+			updated_at TIMESTAMP
+		);
 	`)
 	if err != nil {
 		db.Close()
 		return nil, fmt.Errorf("failed to create tables: %v", err)
 	}
 
+	if err := createMessageSearchIndex(db); err != nil {
+		db.Close()
+		return nil, fmt.Errorf("failed to create message search index: %v", err)
+	}
+
+	if err := createMessageStats(db); err != nil {
+		db.Close()
+		return nil, fmt.Errorf("failed to create message statistics: %v", err)
+	}
+
 	return &MessageStore{db: db}, nil
 }
 
+// Create the full-text index over message content used for message search. FTS4 is used because
+// go-sqlite3 compiles it in by default, while FTS5 needs a build tag. The index is an external
+// content table kept up to date by triggers, and is built from the existing messages when it is
+// first created.
+func createMessageSearchIndex(db *sql.DB) error {
+	var exists int
+	err := db.QueryRow("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'").Scan(&exists)
+	if err != nil {
+		return err
+	}
+	if exists > 0 {
+		return nil
+	}
+
+	tx, err := db.Begin()
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
+	_, err = tx.Exec(`
+		CREATE VIRTUAL TABLE messages_fts USING fts4(content="messages", content, tokenize=unicode61);
+
+		CREATE TRIGGER messages_fts_before_update BEFORE UPDATE OF content ON messages BEGIN
+			DELETE FROM messages_fts WHERE docid = old.rowid;
+		END;
+
+		CREATE TRIGGER messages_fts_before_delete BEFORE DELETE ON messages BEGIN
+			DELETE FROM messages_fts WHERE docid = old.rowid;
+		END;
+
+		CREATE TRIGGER messages_fts_after_update AFTER UPDATE OF content ON messages BEGIN
+			INSERT INTO messages_fts(docid, content) VALUES (new.rowid, new.content);
+		END;
+
+		CREATE TRIGGER messages_fts_after_insert AFTER INSERT ON messages BEGIN
+			INSERT INTO messages_fts(docid, content) VALUES (new.rowid, new.content);
+		END;
+
+		INSERT INTO messages_fts(messages_fts) VALUES ('rebuild');
+	`)
+	if err != nil {
+		return err
+	}
+
+	return tx.Commit()
+}
+
+// Create the message_stats table of counters over the stored messages and chats, so statistics
+// are read without scanning the messages table. Triggers keep the counters up to date; they are
+// seeded from the existing data when the table is first created. Keys are total_messages,
+// total_chats and media_<type> for every media type seen.
+func createMessageStats(db *sql.DB) error {
+	var exists int
+	err := db.QueryRow("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'message_stats'").Scan(&exists)
+	if err != nil {
+		return err
+	}
+	if exists > 0 {
+		return nil
+	}
+
+	tx, err := db.Begin()
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
+	_, err = tx.Exec(`
+		CREATE TABLE message_stats (
+			key TEXT PRIMARY KEY,
+			value INTEGER NOT NULL
+		);
+
+		CREATE TRIGGER message_stats_message_insert AFTER INSERT ON messages BEGIN
+			UPDATE message_stats SET value = value + 1 WHERE key = 'total_messages';
+		END;
+
+		CREATE TRIGGER message_stats_message_delete AFTER DELETE ON messages BEGIN
+			UPDATE message_stats SET value = value - 1 WHERE key = 'total_messages';
+		END;
+
+		CREATE TRIGGER message_stats_media_insert AFTER INSERT ON messages WHEN new.media_type <> '' BEGIN
+			INSERT INTO message_stats (key, value) VALUES ('media_' || new.media_type, 1)
+			ON CONFLICT(key) DO UPDATE SET value = value + 1;
+		END;
+
+		CREATE TRIGGER message_stats_media_delete AFTER DELETE ON messages WHEN old.media_type <> '' BEGIN
+			UPDATE message_stats SET value = value - 1 WHERE key = 'media_' || old.media_type;
+		END;
+
+		CREATE TRIGGER message_stats_media_update AFTER UPDATE OF media_type ON messages
+		WHEN new.media_type IS NOT old.media_type BEGIN
+			UPDATE message_stats SET value = value - 1 WHERE key = 'media_' || old.media_type;
+			INSERT INTO message_stats (key, value) SELECT 'media_' || new.media_type, 1 WHERE new.media_type <> ''
+			ON CONFLICT(key) DO UPDATE SET value = value + 1;
+		END;
+
+		CREATE TRIGGER message_stats_chat_insert AFTER INSERT ON chats BEGIN
+			UPDATE message_stats SET value = value + 1 WHERE key = 'total_chats';
+		END;
+
+		CREATE TRIGGER message_stats_chat_delete AFTER DELETE ON chats BEGIN
+			UPDATE message_stats SET value = value - 1 WHERE key = 'total_chats';
+		END;
+
+		INSERT INTO message_stats (key, value) SELECT 'total_messages', COUNT(*) FROM messages;
+		INSERT INTO message_stats (key, value) SELECT 'total_chats', COUNT(*) FROM chats;
+		INSERT INTO message_stats (key, value)
+			SELECT 'media_' || media_type, COUNT(*) FROM messages WHERE media_type <> '' GROUP BY media_type;
+	`)
+	if err != nil {
+		return err
+	}
+
+	return tx.Commit()
+}
+
 // Close the database connection
 func (store *MessageStore) Close() error {
 	return store.db.Close()
@@ -100,8 +243,11 @@ func (store *MessageStore) Close() error {
 
 // Store a chat in the database
 func (store *MessageStore) StoreChat(jid, name string, lastMessageTime time.Time) error {
+	// Upsert rather than INSERT OR REPLACE, which would fire the insert trigger of an existing
+	// chat and count it twice in message_stats
 	_, err := store.db.Exec(
-		"INSERT OR REPLACE INTO chats (jid, name, last_message_time) VALUES (?, ?, ?)",
+		`INSERT INTO chats (jid, name, last_message_time) VALUES (?, ?, ?)
+		ON CONFLICT(jid) DO UPDATE SET name = excluded.name, last_message_time = excluded.last_message_time`,
 		jid, name, lastMessageTime,
 	)
 	return err
@@ -115,15 +261,151 @@ func (store *MessageStore) StoreMessage(id, chatJID, sender, content string, tim
 		return nil
 	}
 
+	// Upsert rather than INSERT OR REPLACE: a REPLACE deletes the old row without firing delete
+	// triggers, which would leave stale entries in the search index
 	_, err := store.db.Exec(
-		`INSERT OR REPLACE INTO messages 
+		`INSERT INTO messages 
 		(id, chat_jid, sender, content, timestamp, is_from_me, media_type, filename, url, media_key, file_sha256, file_enc_sha256, file_length) 
-		VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)`,
+		VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+		ON CONFLICT(id, chat_jid) DO UPDATE SET
+			sender = excluded.sender,
+			content = excluded.content,
+			timestamp = excluded.timestamp,
+			is_from_me = excluded.is_from_me,
+			media_type = excluded.media_type,
+			filename = excluded.filename,
+			url = excluded.url,
+			media_key = excluded.media_key,
+			file_sha256 = excluded.file_sha256,
+			file_enc_sha256 = excluded.file_enc_sha256,
+			file_length = excluded.file_length`,
 		id, chatJID, sender, content, timestamp, isFromMe, mediaType, filename, url, mediaKey, fileSHA256, fileEncSHA256, fileLength,
 	)
 	return err
 }
 
+// Number of history sync messages written per transaction
+const historyBatchSize = 500
+
+// HistoryMessage is a message from a history sync page waiting to be stored
+type HistoryMessage struct {
+	PageIndex     int
+	ID            string
+	Sender        string
+	Content       string
+	Timestamp     time.Time
+	IsFromMe      bool
+	MediaType     string
+	Filename      string
+	URL           string
+	MediaKey      []byte
+	FileSHA256    []byte
+	FileEncSHA256 []byte
+	FileLength    uint64
+	// Set by StoreHistoryBatch when the message was already stored
+	Duplicate bool
+}
+
+// Store a batch of history sync messages of one chat in a single transaction, advancing the chat's
+// sync checkpoint in the same transaction so an interrupted sync resumes right after the last batch
+// that was actually written. Messages that are already stored are left untouched and flagged as
+// duplicates; the number of newly inserted messages is returned.
+func (store *MessageStore) StoreHistoryBatch(chatJID, pageCursor string, batch []HistoryMessage) (int, error) {
+	if len(batch) == 0 {
+		return 0, nil
+	}
+
+	tx, err := store.db.Begin()
+	if err != nil {
+		return 0, err
+	}
+	defer tx.Rollback()
+
+	stmt, err := tx.Prepare(
+		`INSERT INTO messages 
+		(id, chat_jid, sender, content, timestamp, is_from_me, media_type, filename, url, media_key, file_sha256, file_enc_sha256, file_length) 
+		VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+		ON CONFLICT(id, chat_jid) DO NOTHING`,
+	)
+	if err != nil {
+		return 0, err
+	}
+	defer stmt.Close()
+
+	inserted := 0
+	for i := range batch {
+		m := &batch[i]
+		res, err := stmt.Exec(
+			m.ID, chatJID, m.Sender, m.Content, m.Timestamp, m.IsFromMe, m.MediaType, m.Filename, m.URL,
+			m.MediaKey, m.FileSHA256, m.FileEncSHA256, m.FileLength,
+		)
+		if err != nil {
+			return 0, err
+		}
+
+		n, err := res.RowsAffected()
+		if err != nil {
+			return 0, err
+		}
+		m.Duplicate = n == 0
+		inserted += int(n)
+	}
+
+	last := batch[len(batch)-1]
+	_, err = tx.Exec(
+		"INSERT OR REPLACE INTO sync_checkpoints (chat_jid, page_cursor, last_applied_index, last_message_id, updated_at) VALUES (?, ?, ?, ?, ?)",
+		chatJID, pageCursor, last.PageIndex, last.ID, time.Now(),
+	)
+	if err != nil {
+		return 0, err
+	}
+
+	if err := tx.Commit(); err != nil {
+		return 0, err
+	}
+	return inserted, nil
+}
+
+// Get the ID of the last message applied from a history sync page, or "" if the page has no checkpoint
+func (store *MessageStore) GetSyncCheckpoint(chatJID, pageCursor string) string {
+	var lastMessageID string
+	err := store.db.QueryRow(
+		"SELECT last_message_id FROM sync_checkpoints WHERE chat_jid = ? AND page_cursor = ?",
+		chatJID, pageCursor,
+	).Scan(&lastMessageID)
+	if err != nil {
+		return ""
+	}
+	return lastMessageID
+}
+
+// Clear the sync checkpoint of a chat once its history sync page has been fully applied
+func (store *MessageStore) ClearSyncCheckpoint(chatJID string) error {
+	_, err := store.db.Exec("DELETE FROM sync_checkpoints WHERE chat_jid = ?", chatJID)
+	return err
+}
+
+// Get the message statistics counters, keyed as in the message_stats table
+func (store *MessageStore) GetMessageStats() (map[string]int64, error) {
+	rows, err := store.db.Query("SELECT key, value FROM message_stats")
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	stats := make(map[string]int64)
+	for rows.Next() {
+		var key string
+		var value int64
+		if err := rows.Scan(&key, &value); err != nil {
+			return nil, err
+		}
+		stats[key] = value
+	}
+
+	return stats, rows.Err()
+}
+
 // Get messages from a chat
 func (store *MessageStore) GetMessages(chatJID string, limit int) ([]Message, error) {
 	rows, err := store.db.Query(
@@ -203,7 +485,7 @@ type SendMessageRequest struct {
 }
 
 // Function to send a WhatsApp message
-func sendWhatsAppMessage(client *whatsmeow.Client, recipient string, message string, mediaPath string) (bool, string) {
+func sendWhatsAppMessage(client *whatsmeow.Client, limiter *AdaptiveLimiter, recipient string, message string, mediaPath string) (bool, string) {
 	if !client.IsConnected() {
 		return false, "Not connected to WhatsApp"
 	}
@@ -283,7 +565,11 @@ func sendWhatsAppMessage(client *whatsmeow.Client, recipient string, message str
 		}
 
 		// Upload media to WhatsApp servers
-		resp, err := client.Upload(context.Background(), mediaData, mediaType)
+		var resp whatsmeow.UploadResponse
+		err = limiter.Do(func(ctx context.Context) (err error) {
+			resp, err = client.Upload(ctx, mediaData, mediaType)
+			return err
+		})
 		if err != nil {
 			return false, fmt.Sprintf("Error uploading media: %v", err)
 		}
@@ -362,7 +648,10 @@ func sendWhatsAppMessage(client *whatsmeow.Client, recipient string, message str
 	}
 
 	// Send message
-	_, err = client.SendMessage(context.Background(), recipientJID, msg)
+	err = limiter.Do(func(ctx context.Context) (err error) {
+		_, err = client.SendMessage(ctx, recipientJID, msg)
+		return err
+	})
 
 	if err != nil {
 		return false, fmt.Sprintf("Error sending message: %v", err)
@@ -554,7 +843,7 @@ func (d *MediaDownloader) GetMediaType() whatsmeow.MediaType {
 }
 
 // Function to download media from a message
-func downloadMedia(client *whatsmeow.Client, messageStore *MessageStore, messageID, chatJID string) (bool, string, string, string, error) {
+func downloadMedia(client *whatsmeow.Client, messageStore *MessageStore, limiter *AdaptiveLimiter, messageID, chatJID string) (bool, string, string, string, error) {
 	// Query the database for the message
 	var mediaType, filename, url string
 	var mediaKey, fileSHA256, fileEncSHA256 []byte
@@ -641,7 +930,11 @@ func downloadMedia(client *whatsmeow.Client, messageStore *MessageStore, message
 	}
 
 	// Download the media using whatsmeow client
-	mediaData, err := client.Download(context.Background(), downloader)
+	var mediaData []byte
+	err = limiter.Do(func(ctx context.Context) (err error) {
+		mediaData, err = client.Download(ctx, downloader)
+		return err
+	})
 	if err != nil {
 		return false, "", "", "", fmt.Errorf("failed to download media: %v", err)
 	}
@@ -675,8 +968,119 @@ func extractDirectPathFromURL(url string) string {
 	return "/" + pathPart
 }
 
+// AdaptiveLimiter bounds the number of concurrent calls to WhatsApp. The limit grows additively
+// while calls succeed and is halved when they fail (AIMD), so callers queue for a slot instead of
+// piling more work onto an already struggling connection.
+type AdaptiveLimiter struct {
+	mu       sync.Mutex
+	limit    float64
+	minLimit float64
+	maxLimit float64
+	inFlight int
+	released chan struct{}
+	maxWait  time.Duration
+}
+
+// NewAdaptiveLimiter creates a limiter starting at initial concurrent calls, kept within [minLimit, maxLimit].
+// Callers wait at most maxWait for a slot.
+func NewAdaptiveLimiter(initial, minLimit, maxLimit int, maxWait time.Duration) *AdaptiveLimiter {
+	return &AdaptiveLimiter{
+		limit:    float64(initial),
+		minLimit: float64(minLimit),
+		maxLimit: float64(maxLimit),
+		released: make(chan struct{}),
+		maxWait:  maxWait,
+	}
+}
+
+// Acquire waits for a free slot until ctx is done
+func (l *AdaptiveLimiter) Acquire(ctx context.Context) error {
+	for {
+		l.mu.Lock()
+		if l.inFlight < int(l.limit) {
+			l.inFlight++
+			l.mu.Unlock()
+			return nil
+		}
+		released := l.released
+		l.mu.Unlock()
+
+		select {
+		case <-released:
+		case <-ctx.Done():
+			return fmt.Errorf("timed out waiting for a free WhatsApp connection slot")
+		}
+	}
+}
+
+// Release frees the slot of a finished call and adapts the limit to its outcome
+func (l *AdaptiveLimiter) Release(success bool) {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+
+	l.inFlight--
+	if success {
+		l.limit = math.Min(l.maxLimit, l.limit+1/l.limit)
+	} else {
+		l.limit = math.Max(l.minLimit, l.limit/2)
+	}
+
+	// Wake up the waiting callers
+	close(l.released)
+	l.released = make(chan struct{})
+}
+
+// Do runs a call to WhatsApp in a slot. Only errors showing WhatsApp or the connection is struggling
+// shrink the limit, so requests failing on their own (e.g. expired media) don't throttle others.
+func (l *AdaptiveLimiter) Do(call func(ctx context.Context) error) error {
+	ctx, cancel := context.WithTimeout(context.Background(), l.maxWait)
+	defer cancel()
+	if err := l.Acquire(ctx); err != nil {
+		return err
+	}
+
+	err := call(context.Background())
+	l.Release(!isOverloadError(err))
+	return err
+}
+
+// Check whether an error from WhatsApp is a timeout, a transport failure or a server error
+// (5xx or rate limit), as opposed to a failure specific to the request such as a 404 or 410
+func isOverloadError(err error) bool {
+	if err == nil {
+		return false
+	}
+	if errors.Is(err, context.DeadlineExceeded) || errors.Is(err, whatsmeow.ErrIQTimedOut) {
+		return true
+	}
+
+	var netErr net.Error
+	if errors.As(err, &netErr) {
+		return true
+	}
+
+	var httpErr whatsmeow.DownloadHTTPError
+	if errors.As(err, &httpErr) {
+		return httpErr.Response != nil && isOverloadStatus(httpErr.StatusCode)
+	}
+
+	var iqErr *whatsmeow.IQError
+	if errors.As(err, &iqErr) {
+		return isOverloadStatus(iqErr.Code)
+	}
+	return false
+}
+
+// Check whether an HTTP-like status code means the server is overloaded or failing
+func isOverloadStatus(code int) bool {
+	return code == http.StatusTooManyRequests || code >= 500
+}
+
 // Start a REST API server to expose the WhatsApp client functionality
 func startRESTServer(client *whatsmeow.Client, messageStore *MessageStore, port int) {
+	// Shared by every handler that calls out to WhatsApp
+	limiter := NewAdaptiveLimiter(8, 1, 32, 2*time.Minute)
+
 	// Handler for sending messages
 	http.HandleFunc("/api/send", func(w http.ResponseWriter, r *http.Request) {
 		// Only allow POST requests
@@ -706,7 +1110,7 @@ func startRESTServer(client *whatsmeow.Client, messageStore *MessageStore, port
 		fmt.Println("Received request to send message", req.Message, req.MediaPath)
 
 		// Send the message
-		success, message := sendWhatsAppMessage(client, req.Recipient, req.Message, req.MediaPath)
+		success, message := sendWhatsAppMessage(client, limiter, req.Recipient, req.Message, req.MediaPath)
 		fmt.Println("Message sent", success, message)
 		// Set response headers
 		w.Header().Set("Content-Type", "application/json")
@@ -745,7 +1149,7 @@ func startRESTServer(client *whatsmeow.Client, messageStore *MessageStore, port
 		}
 
 		// Download the media
-		success, mediaType, filename, path, err := downloadMedia(client, messageStore, req.MessageID, req.ChatJID)
+		success, mediaType, filename, path, err := downloadMedia(client, messageStore, limiter, req.MessageID, req.ChatJID)
 
 		// Set response headers
 		w.Header().Set("Content-Type", "application/json")
@@ -774,6 +1178,30 @@ func startRESTServer(client *whatsmeow.Client, messageStore *MessageStore, port
 		})
 	})
 
+	// Handler for message statistics
+	http.HandleFunc("/api/stats", func(w http.ResponseWriter, r *http.Request) {
+		// Only allow GET requests
+		if r.Method != http.MethodGet {
+			http.Error(w, "Method not allowed", http.StatusMethodNotAllowed)
+			return
+		}
+
+		stats, err := messageStore.GetMessageStats()
+		if err != nil {
+			http.Error(w, fmt.Sprintf("Failed to get message statistics: %v", err), http.StatusInternalServerError)
+			return
+		}
+
+		// Counters are returned at the top level next to the success flag
+		response := map[string]interface{}{"success": true}
+		for key, value := range stats {
+			response[key] = value
+		}
+
+		w.Header().Set("Content-Type", "application/json")
+		json.NewEncoder(w).Encode(response)
+	})
+
 	// Start the server
 	serverAddr := fmt.Sprintf(":%d", port)
 	fmt.Printf("Starting REST API server on %s...\n", serverAddr)
@@ -784,6 +1212,31 @@ func startRESTServer(client *whatsmeow.Client, messageStore *MessageStore, port
 			fmt.Printf("REST API server error: %v\n", err)
 		}
 	}()
+
+	// Also serve the API on a Unix socket when configured, letting local clients skip the TCP stack
+	if socketPath := os.Getenv("WHATSAPP_BRIDGE_SOCKET"); socketPath != "" {
+		startRESTSocket(socketPath)
+	}
+}
+
+// Serve the REST API on a Unix domain socket, replacing a socket left behind by a previous run
+func startRESTSocket(socketPath string) {
+	if info, err := os.Lstat(socketPath); err == nil && info.Mode()&os.ModeSocket != 0 {
+		os.Remove(socketPath)
+	}
+
+	listener, err := net.Listen("unix", socketPath)
+	if err != nil {
+		fmt.Printf("REST API socket error: %v\n", err)
+		return
+	}
+	fmt.Printf("Starting REST API server on %s...\n", socketPath)
+
+	go func() {
+		if err := http.Serve(listener, nil); err != nil {
+			fmt.Printf("REST API socket server error: %v\n", err)
+		}
+	}()
 }
 
 func main() {
@@ -929,7 +1382,7 @@ func GetChatName(client *whatsmeow.Client, messageStore *MessageStore, jid types
 	err := messageStore.db.QueryRow("SELECT name FROM chats WHERE jid = ?", chatJID).Scan(&existingName)
 	if err == nil && existingName != "" {
 		// Chat exists with a name, use that
-		logger.Infof("Using existing chat name for %s: %s", chatJID, existingName)
+		logger.Debugf("Using existing chat name for %s: %s", chatJID, existingName)
 		return existingName
 	}
 
@@ -938,7 +1391,7 @@ func GetChatName(client *whatsmeow.Client, messageStore *MessageStore, jid types
 
 	if jid.Server == "g.us" {
 		// This is a group chat
-		logger.Infof("Getting name for group: %s", chatJID)
+		logger.Debugf("Getting name for group: %s", chatJID)
 
 		// Use conversation data if provided (from history sync)
 		if conversation != nil {
@@ -982,10 +1435,10 @@ func GetChatName(client *whatsmeow.Client, messageStore *MessageStore, jid types
 			}
 		}
 
-		logger.Infof("Using group name: %s", name)
+		logger.Debugf("Using group name: %s", name)
 	} else {
 		// This is an individual contact
-		logger.Infof("Getting name for contact: %s", chatJID)
+		logger.Debugf("Getting name for contact: %s", chatJID)
 
 		// Just use contact info (full name)
 		contact, err := client.Store.Contacts.GetContact(context.Background(), jid)
@@ -999,17 +1452,67 @@ func GetChatName(client *whatsmeow.Client, messageStore *MessageStore, jid types
 			name = jid.User
 		}
 
-		logger.Infof("Using contact name: %s", name)
+		logger.Debugf("Using contact name: %s", name)
 	}
 
 	return name
 }
 
+// Maximum number of chat names resolved concurrently during a history sync
+const chatNameWorkers = 8
+
+// Resolve the names of all chats in a history sync with a bounded pool of workers. Resolving a
+// group name can take a round-trip to WhatsApp, which would otherwise serialize the whole sync.
+func resolveChatNames(client *whatsmeow.Client, messageStore *MessageStore, historySync *events.HistorySync, logger waLog.Logger) map[string]string {
+	names := make(map[string]string)
+	var mu sync.Mutex
+	var wg sync.WaitGroup
+	workers := make(chan struct{}, chatNameWorkers)
+
+	for _, conversation := range historySync.Data.Conversations {
+		if conversation.ID == nil {
+			continue
+		}
+
+		chatJID := *conversation.ID
+		jid, err := types.ParseJID(chatJID)
+		if err != nil {
+			// Reported when the conversation itself is processed
+			continue
+		}
+
+		wg.Add(1)
+		workers <- struct{}{}
+		go func() {
+			defer wg.Done()
+			defer func() { <-workers }()
+
+			name := GetChatName(client, messageStore, jid, chatJID, conversation, "", logger)
+
+			mu.Lock()
+			names[chatJID] = name
+			mu.Unlock()
+		}()
+	}
+
+	wg.Wait()
+	return names
+}
+
 // Handle history sync events
 func handleHistorySync(client *whatsmeow.Client, messageStore *MessageStore, historySync *events.HistorySync, logger waLog.Logger) {
 	fmt.Printf("Received history sync event with %d conversations\n", len(historySync.Data.Conversations))
 
+	// Kind and position of this history sync page. On-demand syncs reuse the same values, so a checkpoint
+	// is only resumed from when its last message is found in the page
+	pageCursor := fmt.Sprintf("%s:%d", historySync.Data.GetSyncType(), historySync.Data.GetChunkOrder())
+
+	// Get appropriate chat names by passing the history sync conversations directly
+	names := resolveChatNames(client, messageStore, historySync, logger)
+
 	syncedCount := 0
+	duplicateCount := 0
+	resumedCount := 0
 	for _, conversation := range historySync.Data.Conversations {
 		// Parse JID from the conversation
 		if conversation.ID == nil {
@@ -1025,8 +1528,7 @@ func handleHistorySync(client *whatsmeow.Client, messageStore *MessageStore, his
 			continue
 		}
 
-		// Get appropriate chat name by passing the history sync conversation directly
-		name := GetChatName(client, messageStore, jid, chatJID, conversation, "", logger)
+		name := names[chatJID]
 
 		// Process messages
 		messages := conversation.Messages
@@ -1047,8 +1549,59 @@ func handleHistorySync(client *whatsmeow.Client, messageStore *MessageStore, his
 
 			messageStore.StoreChat(chatJID, name, timestamp)
 
+			// Resume after the last message applied from this page if a previous sync was interrupted
+			lastAppliedIndex := -1
+			if lastMessageID := messageStore.GetSyncCheckpoint(chatJID, pageCursor); lastMessageID != "" {
+				for i, msg := range messages {
+					if msg.GetMessage().GetKey().GetID() == lastMessageID {
+						lastAppliedIndex = i
+						resumedCount++
+						logger.Infof("Resuming history sync for %s after message %s", chatJID, lastMessageID)
+						break
+					}
+				}
+			}
+
+			// Messages are written in batches, each in a single transaction
+			var batch []HistoryMessage
+			failed := false
+			flushBatch := func() {
+				if len(batch) == 0 {
+					return
+				}
+
+				inserted, err := messageStore.StoreHistoryBatch(chatJID, pageCursor, batch)
+				if err != nil {
+					// Stop here so the checkpoint stays before the messages that weren't written
+					logger.Warnf("Failed to store %d history messages: %v", len(batch), err)
+					failed = true
+				} else {
+					syncedCount += inserted
+					duplicateCount += len(batch) - inserted
+					// Log successful message storage; per-message lines are debug level so a
+					// history sync of thousands of messages doesn't flood the console
+					for _, m := range batch {
+						if m.Duplicate {
+							continue
+						}
+						if m.MediaType != "" {
+							logger.Debugf("Stored message: [%s] %s -> %s: [%s: %s] %s",
+								m.Timestamp.Format("2006-01-02 15:04:05"), m.Sender, chatJID, m.MediaType, m.Filename, m.Content)
+						} else {
+							logger.Debugf("Stored message: [%s] %s -> %s: %s",
+								m.Timestamp.Format("2006-01-02 15:04:05"), m.Sender, chatJID, m.Content)
+						}
+					}
+				}
+				batch = batch[:0]
+			}
+
 			// Store messages
-			for _, msg := range messages {
+			for i, msg := range messages {
+				if i <= lastAppliedIndex {
+					continue
+				}
+
 				if msg == nil || msg.Message == nil {
 					continue
 				}
@@ -1073,7 +1626,7 @@ func handleHistorySync(client *whatsmeow.Client, messageStore *MessageStore, his
 				}
 
 				// Log the message content for debugging
-				logger.Infof("Message content: %v, Media Type: %v", content, mediaType)
+				logger.Debugf("Message content: %v, Media Type: %v", content, mediaType)
 
 				// Skip messages with no content and no media
 				if content == "" && mediaType == "" {
@@ -1112,39 +1665,42 @@ func handleHistorySync(client *whatsmeow.Client, messageStore *MessageStore, his
 					continue
 				}
 
-				err = messageStore.StoreMessage(
-					msgID,
-					chatJID,
-					sender,
-					content,
-					timestamp,
-					isFromMe,
-					mediaType,
-					filename,
-					url,
-					mediaKey,
-					fileSHA256,
-					fileEncSHA256,
-					fileLength,
-				)
-				if err != nil {
-					logger.Warnf("Failed to store history message: %v", err)
-				} else {
-					syncedCount++
-					// Log successful message storage
-					if mediaType != "" {
-						logger.Infof("Stored message: [%s] %s -> %s: [%s: %s] %s",
-							timestamp.Format("2006-01-02 15:04:05"), sender, chatJID, mediaType, filename, content)
-					} else {
-						logger.Infof("Stored message: [%s] %s -> %s: %s",
-							timestamp.Format("2006-01-02 15:04:05"), sender, chatJID, content)
+				batch = append(batch, HistoryMessage{
+					PageIndex:     i,
+					ID:            msgID,
+					Sender:        sender,
+					Content:       content,
+					Timestamp:     timestamp,
+					IsFromMe:      isFromMe,
+					MediaType:     mediaType,
+					Filename:      filename,
+					URL:           url,
+					MediaKey:      mediaKey,
+					FileSHA256:    fileSHA256,
+					FileEncSHA256: fileEncSHA256,
+					FileLength:    fileLength,
+				})
+				if len(batch) >= historyBatchSize {
+					flushBatch()
+					if failed {
+						break
 					}
 				}
 			}
+			flushBatch()
+			if failed {
+				continue
+			}
+
+			// The whole page has been applied, drop its checkpoint
+			if err := messageStore.ClearSyncCheckpoint(chatJID); err != nil {
+				logger.Warnf("Failed to clear sync checkpoint for %s: %v", chatJID, err)
+			}
 		}
 	}
 
-	fmt.Printf("History sync complete. Stored %d messages.\n", syncedCount)
+	fmt.Printf("History sync complete. Stored %d messages, skipped %d already stored (resumed %d conversations from checkpoint).\n",
+		syncedCount, duplicateCount, resumedCount)
 }
 
 // Request history sync from the server
@@ -1,6 +1,7 @@
 import os
 import subprocess
 import tempfile
+from pathlib import Path
 
 def convert_to_opus_ogg(input_file, output_file=None, bitrate="32k", sample_rate=24000):
     """
@@ -87,8 +88,7 @@ def convert_to_opus_ogg_temp(input_file, bitrate="32k", sample_rate=24000):
         return temp_file.name
     except Exception as e:
         # Clean up the temporary file if conversion fails
-        if os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+        Path(temp_file.name).unlink(missing_ok=True)
         raise e
 
 
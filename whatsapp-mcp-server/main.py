@@ -1,3 +1,5 @@
+import asyncio
+import threading
 from typing import List, Dict, Any, Optional
 from mcp.server.fastmcp import FastMCP
 from whatsapp import (
@@ -9,27 +11,37 @@ from whatsapp import (
     get_contact_chats as whatsapp_get_contact_chats,
     get_last_interaction as whatsapp_get_last_interaction,
     get_message_context as whatsapp_get_message_context,
+    get_sync_checkpoints as whatsapp_get_sync_checkpoints,
+    get_message_stats as whatsapp_get_message_stats,
     send_message as whatsapp_send_message,
     send_file as whatsapp_send_file,
     send_audio_message as whatsapp_audio_voice_message,
-    download_media as whatsapp_download_media
+    download_media as whatsapp_download_media,
+    warm_up as whatsapp_warm_up
 )
 
 # Initialize FastMCP server
 mcp = FastMCP("whatsapp")
 
+# Tools are async and run the blocking database and bridge calls in worker threads, so
+# concurrent tool calls overlap instead of queueing behind each other on the event loop
+
+def _result(success: bool, message: str, **extra: Any) -> Dict[str, Any]:
+    """Build the success/message response returned by the tools that act on WhatsApp."""
+    return {"success": success, "message": message, **extra}
+
 @mcp.tool()
-def search_contacts(query: str) -> List[Dict[str, Any]]:
+async def search_contacts(query: str) -> List[Dict[str, Any]]:
     """Search WhatsApp contacts by name or phone number.
     
     Args:
         query: Search term to match against contact names or phone numbers
     """
-    contacts = whatsapp_search_contacts(query)
+    contacts = await asyncio.to_thread(whatsapp_search_contacts, query)
     return contacts
 
 @mcp.tool()
-def list_messages(
+async def list_messages(
     after: Optional[str] = None,
     before: Optional[str] = None,
     sender_phone_number: Optional[str] = None,
@@ -39,7 +51,8 @@ def list_messages(
     page: int = 0,
     include_context: bool = True,
     context_before: int = 1,
-    context_after: int = 1
+    context_after: int = 1,
+    before_id: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """Get WhatsApp messages matching specified criteria with optional context.
     
@@ -50,12 +63,16 @@ def list_messages(
         chat_jid: Optional chat JID to filter messages by chat
         query: Optional search term to filter messages by content
         limit: Maximum number of messages to return (default 20)
-        page: Page number for pagination (default 0)
+        page: Page number for pagination (default 0). To page deep into history, pass the timestamp
+              and ID of the oldest message received as `before` and `before_id` instead
         include_context: Whether to include messages before and after matches (default True)
         context_before: Number of messages to include before each match (default 1)
         context_after: Number of messages to include after each match (default 1)
+        before_id: Optional ID of the message whose timestamp is passed as `before`, to also return
+                   the older messages sharing that timestamp
     """
-    messages = whatsapp_list_messages(
+    messages = await asyncio.to_thread(
+        whatsapp_list_messages,
         after=after,
         before=before,
         sender_phone_number=sender_phone_number,
@@ -65,12 +82,13 @@ def list_messages(
         page=page,
         include_context=include_context,
         context_before=context_before,
-        context_after=context_after
+        context_after=context_after,
+        before_id=before_id
     )
     return messages
 
 @mcp.tool()
-def list_chats(
+async def list_chats(
     query: Optional[str] = None,
     limit: int = 20,
     page: int = 0,
@@ -86,7 +104,8 @@ def list_chats(
         include_last_message: Whether to include the last message in each chat (default True)
         sort_by: Field to sort results by, either "last_active" or "name" (default "last_active")
     """
-    chats = whatsapp_list_chats(
+    chats = await asyncio.to_thread(
+        whatsapp_list_chats,
         query=query,
         limit=limit,
         page=page,
@@ -96,28 +115,28 @@ def list_chats(
     return chats
 
 @mcp.tool()
-def get_chat(chat_jid: str, include_last_message: bool = True) -> Dict[str, Any]:
+async def get_chat(chat_jid: str, include_last_message: bool = True) -> Dict[str, Any]:
     """Get WhatsApp chat metadata by JID.
     
     Args:
         chat_jid: The JID of the chat to retrieve
         include_last_message: Whether to include the last message (default True)
     """
-    chat = whatsapp_get_chat(chat_jid, include_last_message)
+    chat = await asyncio.to_thread(whatsapp_get_chat, chat_jid, include_last_message)
     return chat
 
 @mcp.tool()
-def get_direct_chat_by_contact(sender_phone_number: str) -> Dict[str, Any]:
+async def get_direct_chat_by_contact(sender_phone_number: str) -> Dict[str, Any]:
     """Get WhatsApp chat metadata by sender phone number.
     
     Args:
         sender_phone_number: The phone number to search for
     """
-    chat = whatsapp_get_direct_chat_by_contact(sender_phone_number)
+    chat = await asyncio.to_thread(whatsapp_get_direct_chat_by_contact, sender_phone_number)
     return chat
 
 @mcp.tool()
-def get_contact_chats(jid: str, limit: int = 20, page: int = 0) -> List[Dict[str, Any]]:
+async def get_contact_chats(jid: str, limit: int = 20, page: int = 0) -> List[Dict[str, Any]]:
     """Get all WhatsApp chats involving the contact.
     
     Args:
@@ -125,21 +144,21 @@ def get_contact_chats(jid: str, limit: int = 20, page: int = 0) -> List[Dict[str
         limit: Maximum number of chats to return (default 20)
         page: Page number for pagination (default 0)
     """
-    chats = whatsapp_get_contact_chats(jid, limit, page)
+    chats = await asyncio.to_thread(whatsapp_get_contact_chats, jid, limit, page)
     return chats
 
 @mcp.tool()
-def get_last_interaction(jid: str) -> str:
+async def get_last_interaction(jid: str) -> str:
     """Get most recent WhatsApp message involving the contact.
     
     Args:
         jid: The JID of the contact to search for
     """
-    message = whatsapp_get_last_interaction(jid)
+    message = await asyncio.to_thread(whatsapp_get_last_interaction, jid)
     return message
 
 @mcp.tool()
-def get_message_context(
+async def get_message_context(
     message_id: str,
     before: int = 5,
     after: int = 5
@@ -151,11 +170,31 @@ def get_message_context(
         before: Number of messages to include before the target message (default 5)
         after: Number of messages to include after the target message (default 5)
     """
-    context = whatsapp_get_message_context(message_id, before, after)
+    context = await asyncio.to_thread(whatsapp_get_message_context, message_id, before, after)
     return context
 
 @mcp.tool()
-def send_message(
+async def get_sync_checkpoints() -> List[Dict[str, Any]]:
+    """Get the history sync progress of every WhatsApp chat whose history is still being synced.
+    
+    Returns one entry per chat with an unfinished history sync page, including the index and ID
+    of the last message stored from that page. An empty list means no history sync is in progress.
+    """
+    checkpoints = await asyncio.to_thread(whatsapp_get_sync_checkpoints)
+    return checkpoints
+
+@mcp.tool()
+async def get_message_stats() -> Dict[str, int]:
+    """Get WhatsApp message statistics.
+    
+    Returns the total number of stored messages and chats, and the number of messages
+    of each media type (e.g. media_image, media_video).
+    """
+    stats = await asyncio.to_thread(whatsapp_get_message_stats)
+    return stats
+
+@mcp.tool()
+async def send_message(
     recipient: str,
     message: str
 ) -> Dict[str, Any]:
@@ -171,20 +210,14 @@ def send_message(
     """
     # Validate input
     if not recipient:
-        return {
-            "success": False,
-            "message": "Recipient must be provided"
-        }
+        return _result(False, "Recipient must be provided")
     
     # Call the whatsapp_send_message function with the unified recipient parameter
-    success, status_message = whatsapp_send_message(recipient, message)
-    return {
-        "success": success,
-        "message": status_message
-    }
+    success, status_message = await asyncio.to_thread(whatsapp_send_message, recipient, message)
+    return _result(success, status_message)
 
 @mcp.tool()
-def send_file(recipient: str, media_path: str) -> Dict[str, Any]:
+async def send_file(recipient: str, media_path: str) -> Dict[str, Any]:
     """Send a file such as a picture, raw audio, video or document via WhatsApp to the specified recipient. For group messages use the JID.
     
     Args:
@@ -197,14 +230,11 @@ def send_file(recipient: str, media_path: str) -> Dict[str, Any]:
     """
     
     # Call the whatsapp_send_file function
-    success, status_message = whatsapp_send_file(recipient, media_path)
-    return {
-        "success": success,
-        "message": status_message
-    }
+    success, status_message = await asyncio.to_thread(whatsapp_send_file, recipient, media_path)
+    return _result(success, status_message)
 
 @mcp.tool()
-def send_audio_message(recipient: str, media_path: str) -> Dict[str, Any]:
+async def send_audio_message(recipient: str, media_path: str) -> Dict[str, Any]:
     """Send any audio file as a WhatsApp audio message to the specified recipient. For group messages use the JID. If it errors due to ffmpeg not being installed, use send_file instead.
     
     Args:
@@ -215,14 +245,11 @@ def send_audio_message(recipient: str, media_path: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing success status and a status message
     """
-    success, status_message = whatsapp_audio_voice_message(recipient, media_path)
-    return {
-        "success": success,
-        "message": status_message
-    }
+    success, status_message = await asyncio.to_thread(whatsapp_audio_voice_message, recipient, media_path)
+    return _result(success, status_message)
 
 @mcp.tool()
-def download_media(message_id: str, chat_jid: str) -> Dict[str, Any]:
+async def download_media(message_id: str, chat_jid: str) -> Dict[str, Any]:
     """Download media from a WhatsApp message and get the local file path.
     
     Args:
@@ -232,20 +259,74 @@ def download_media(message_id: str, chat_jid: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing success status, a status message, and the file path if successful
     """
-    file_path = whatsapp_download_media(message_id, chat_jid)
+    file_path = await asyncio.to_thread(whatsapp_download_media, message_id, chat_jid)
     
     if file_path:
-        return {
-            "success": True,
-            "message": "Media downloaded successfully",
-            "file_path": file_path
-        }
+        return _result(True, "Media downloaded successfully", file_path=file_path)
     else:
-        return {
-            "success": False,
-            "message": "Failed to download media"
-        }
+        return _result(False, "Failed to download media")
+
+# Names of the tools that batch_tool_calls can dispatch
+_BATCHABLE_TOOLS = frozenset(
+    tool.__name__
+    for tool in (
+        search_contacts,
+        list_messages,
+        list_chats,
+        get_chat,
+        get_direct_chat_by_contact,
+        get_contact_chats,
+        get_last_interaction,
+        get_message_context,
+        get_sync_checkpoints,
+        get_message_stats,
+        send_message,
+        send_file,
+        send_audio_message,
+        download_media,
+    )
+)
+
+# Maximum number of calls of a batch running at once, to avoid flooding the bridge. Kept at or
+# below the bridge's initial send/download limit (NewAdaptiveLimiter in whatsapp-bridge/main.go),
+# which queues calls beyond its current limit rather than rejecting them
+_BATCH_CONCURRENCY = 8
+
+@mcp.tool()
+async def batch_tool_calls(calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run several independent WhatsApp tool calls concurrently and return all their results.
+    
+    Use this instead of calling tools one after another when the calls don't depend on each
+    other, e.g. fetching several chats or sending the same message to several recipients.
+    
+    Args:
+        calls: The calls to make, each a dictionary with the tool "name" and its "args" dictionary
+               (e.g. {"name": "get_chat", "args": {"chat_jid": "123456789@s.whatsapp.net"}})
+    
+    Returns:
+        One dictionary per call, in the same order, with the tool name and either its "result"
+        or an "error" message
+    """
+    semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+    async def run(call: Dict[str, Any]) -> Dict[str, Any]:
+        name = call.get("name")
+        if name not in _BATCHABLE_TOOLS:
+            return {"name": name, "error": f"Unknown tool: {name}"}
+
+        async with semaphore:
+            try:
+                # Go through the registered tool so the arguments are validated and coerced
+                # exactly like those of a direct call
+                return {"name": name, "result": await mcp._tool_manager.call_tool(name, call.get("args", {}))}
+            except Exception as e:
+                return {"name": name, "error": str(e)}
+
+    return await asyncio.gather(*(run(call) for call in calls))
 
 if __name__ == "__main__":
+    # Warm up in the background so the server starts answering right away
+    threading.Thread(target=whatsapp_warm_up, daemon=True).start()
+
     # Initialize and run the server
     mcp.run(transport='stdio')
\ No newline at end of file
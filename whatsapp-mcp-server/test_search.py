@@ -0,0 +1,45 @@
+import random
+import sqlite3
+
+from whatsapp import _search_phrases
+
+# Characters and words that stress the tokenizer, LIKE wildcards and the full-text query syntax
+_ALPHABET = list("abcé _%.@-:()'\"*^12 苹果我x́\t") + ["hello", "othello", "world", "NEAR", "OR", "NOT", "   "]
+
+def _message_db(contents):
+    """Create a database with the bridge's messages table and full-text index."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE messages (content TEXT)")
+    conn.execute('CREATE VIRTUAL TABLE messages_fts USING fts4(content="messages", content, tokenize=unicode61)')
+    conn.executemany("INSERT INTO messages (content) VALUES (?)", [(c,) for c in contents])
+    conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+    return conn
+
+def _like(conn, query):
+    return {row[0] for row in conn.execute(
+        "SELECT rowid FROM messages WHERE LOWER(content) LIKE LOWER(?)", (f"%{query}%",)
+    )}
+
+def _prefiltered(conn, query):
+    phrases = _search_phrases(query)
+    if not phrases:
+        return _like(conn, query)
+    return {row[0] for row in conn.execute(
+        "SELECT rowid FROM messages WHERE rowid IN (SELECT docid FROM messages_fts WHERE messages_fts MATCH ?)"
+        " AND LOWER(content) LIKE LOWER(?)", (phrases, f"%{query}%")
+    )}
+
+def test_search_phrases_keep_substring_matches():
+    conn = _message_db(["hello world", "othello play", "call 5551234", "我喜欢苹果", "see x ^foo y now"])
+    for query in ["ello", "hello", "1234", "苹果", "lo wor", "x ^foo y", "x@y.com", "+39 123"]:
+        assert _prefiltered(conn, query) == _like(conn, query), query
+
+def test_search_phrases_match_like_on_random_messages():
+    rng = random.Random(0)
+    contents = ["".join(rng.choice(_ALPHABET) for _ in range(rng.randint(1, 12))) for _ in range(2000)]
+    conn = _message_db(contents)
+    for content in rng.sample(contents, 1000):
+        start = rng.randrange(len(content))
+        query = content[start:rng.randint(start + 1, len(content))]
+        if query.strip():
+            assert _prefiltered(conn, query) == _like(conn, query), query
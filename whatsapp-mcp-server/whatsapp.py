@@ -1,16 +1,33 @@
 import sqlite3
 from datetime import datetime
 from dataclasses import dataclass, asdict
-from typing import Optional, List, Tuple
+from concurrent.futures import Future
+from functools import wraps
+from typing import Optional, List, Dict, Tuple
 import os.path
-import requests
+import inspect
+import sys
+import unicodedata
 import json
+import threading
+import time
+import httpx
 import audio
 
 MESSAGES_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'whatsapp-bridge', 'store', 'messages.db')
 WHATSAPP_API_BASE_URL = "http://localhost:8080/api"
+_SEND_URL = f"{WHATSAPP_API_BASE_URL}/send"
+_DOWNLOAD_URL = f"{WHATSAPP_API_BASE_URL}/download"
+# Servers of the JIDs WhatsApp can deliver to, as defined by whatsmeow
+_JID_SERVERS = frozenset({
+    "s.whatsapp.net", "g.us", "c.us", "broadcast", "lid", "msgr",
+    "interop", "newsletter", "hosted", "hosted.lid", "bot",
+})
 
-@dataclass
+# Path of the bridge's Unix socket, if it serves one; bridge calls then skip the TCP stack
+_BRIDGE_SOCKET = os.environ.get("WHATSAPP_BRIDGE_SOCKET")
+
+@dataclass(slots=True)
 class Message:
     timestamp: datetime
     sender: str
@@ -21,7 +38,7 @@ class Message:
     chat_name: Optional[str] = None
     media_type: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Chat:
     jid: str
     name: Optional[str]
@@ -35,18 +52,162 @@ class Chat:
         """Determine if chat is a group based on JID pattern."""
         return self.jid.endswith("@g.us")
 
-@dataclass
+@dataclass(slots=True)
 class Contact:
     phone_number: str
     name: Optional[str]
     jid: str
 
-@dataclass
+@dataclass(slots=True)
 class MessageContext:
     message: Message
     before: List[Message]
     after: List[Message]
 
+@dataclass(slots=True)
+class SyncCheckpoint:
+    chat_jid: str
+    chat_name: Optional[str]
+    page_cursor: str
+    last_applied_index: int
+    last_message_id: str
+    updated_at: Optional[datetime]
+
+def _message_from_row(row: tuple) -> Message:
+    """Build a Message from a (timestamp, sender, chat_name, content, is_from_me, chat_jid, id, media_type) row.
+
+    JIDs repeat across every message of a chat, so they are interned to share a single string.
+    """
+    return Message(
+        timestamp=datetime.fromisoformat(row[0]),
+        sender=sys.intern(row[1]) if row[1] else row[1],
+        chat_name=row[2],
+        content=row[3],
+        is_from_me=row[4],
+        chat_jid=sys.intern(row[5]),
+        id=row[6],
+        media_type=row[7]
+    )
+
+def _message_to_dict(msg: Message) -> dict:
+    """Convert a Message to a dict with a serializable timestamp.
+
+    Equivalent to asdict() for this flat dataclass, without its recursive deep copy.
+    """
+    return {
+        'timestamp': msg.timestamp.isoformat(),
+        'sender': msg.sender,
+        'content': msg.content,
+        'is_from_me': msg.is_from_me,
+        'chat_jid': msg.chat_jid,
+        'id': msg.id,
+        'chat_name': msg.chat_name,
+        'media_type': msg.media_type,
+    }
+
+def _ttl_cache(ttl: float, maxsize: int = 128):
+    """Cache a function's results per arguments for ttl seconds.
+
+    Concurrent calls with the same arguments that miss the cache wait for a single call
+    of the function instead of all running it. Empty results, which is also what the
+    lookups return on database errors, are not cached. The decorated function gains a
+    cache_clear() method for invalidation.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        entries = {}  # key -> (monotonic time stored, result)
+        in_flight = {}  # key -> Future of the call currently computing it
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Calls spelling the same arguments differently (positional, keyword, defaulted) share an entry
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.items())
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry and now - entry[0] < ttl:
+                    return entry[1]
+                future = in_flight.get(key)
+                if future is not None:
+                    waiting = True
+                else:
+                    future = in_flight[key] = Future()
+                    waiting = False
+
+            if waiting:
+                return future.result()
+
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                with lock:
+                    del in_flight[key]
+                future.set_exception(e)
+                raise
+
+            with lock:
+                del in_flight[key]
+                if result:
+                    if len(entries) >= maxsize:
+                        # Entries are kept in insertion order, so the first one is the oldest
+                        entries.pop(next(iter(entries)))
+                    entries[key] = (now, result)
+            future.set_result(result)
+            return result
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+def _has_message_search_index(cursor: sqlite3.Cursor) -> bool:
+    """Check whether the bridge has built the full-text index over message content."""
+    try:
+        cursor.execute("SELECT 1 FROM messages_fts LIMIT 0")
+        return True
+    except sqlite3.OperationalError:
+        # Database created by an older bridge, or SQLite built without FTS4
+        return False
+
+def _search_phrases(query: str) -> Optional[str]:
+    """Build a full-text query matching every message that contains query, or None if there is none.
+
+    Each whitespace-separated chunk of query is tokenized by the index the same way as in the
+    message, so it is looked up as a phrase. The first chunk may be the end of a longer word and
+    is skipped, the last one may be the start of a longer word and is matched as a prefix. A
+    single-chunk query can match inside any word, which the index can't look up.
+    """
+    chunks = query.split()
+    if not query[0].isspace():
+        chunks = chunks[1:]
+
+    phrases = []
+    for i, chunk in enumerate(chunks):
+        if "%" in chunk or "_" in chunk:
+            # LIKE wildcards, which can stand for any characters of the message
+            continue
+        # Quotes, stars and carets only separate words in the message but are operators in the
+        # query, even inside a phrase ("^" anchors a word to the start of the message)
+        for operator in '"*^':
+            chunk = chunk.replace(operator, " ")
+        chunk = chunk.strip()
+        if i == len(chunks) - 1 and not query[-1].isspace():
+            # Trailing punctuation ends the word anyway, and would detach the prefix operator
+            while chunk and unicodedata.category(chunk[-1])[0] not in "LMN":
+                chunk = chunk[:-1]
+            chunk += "*"
+        if any(c.isalnum() for c in chunk):
+            phrases.append(f'"{chunk}"')
+    return " ".join(phrases) or None
+
+# Formatting a conversation resolves the same few senders over and over
+@_ttl_cache(ttl=2.0)
 def get_sender_name(sender_jid: str) -> str:
     try:
         conn = sqlite3.connect(MESSAGES_DB_PATH)
@@ -85,7 +246,7 @@ def get_sender_name(sender_jid: str) -> str:
             return sender_jid
         
     except sqlite3.Error as e:
-        print(f"Database error while getting sender name: {e}")
+        print(f"Database error while getting sender name: {e}", file=sys.stderr)
         return sender_jid
     finally:
         if 'conn' in locals():
@@ -108,7 +269,7 @@ def format_message(message: Message, show_chat_info: bool = True) -> None:
         sender_name = get_sender_name(message.sender) if not message.is_from_me else "Me"
         output += f"From: {sender_name}: {content_prefix}{message.content}\n"
     except Exception as e:
-        print(f"Error formatting message: {e}")
+        print(f"Error formatting message: {e}", file=sys.stderr)
     return output
 
 def format_messages_list(messages: List[Message], show_chat_info: bool = True) -> None:
@@ -131,7 +292,8 @@ def list_messages(
     page: int = 0,
     include_context: bool = True,
     context_before: int = 1,
-    context_after: int = 1
+    context_after: int = 1,
+    before_id: Optional[str] = None
 ) -> List[Message]:
     """Get messages matching the specified criteria with optional context."""
     try:
@@ -160,8 +322,13 @@ def list_messages(
             except ValueError:
                 raise ValueError(f"Invalid date format for 'before': {before}. Please use ISO-8601 format.")
             
-            where_clauses.append("messages.timestamp < ?")
-            params.append(before)
+            if before_id:
+                # Seek past the last message seen, including the ones sharing its timestamp
+                where_clauses.append("messages.timestamp <= ? AND (messages.timestamp < ? OR messages.id < ?)")
+                params.extend([before, before, before_id])
+            else:
+                where_clauses.append("messages.timestamp < ?")
+                params.append(before)
 
         if sender_phone_number:
             where_clauses.append("messages.sender = ?")
@@ -172,6 +339,12 @@ def list_messages(
             params.append(chat_jid)
             
         if query:
+            # Narrow the candidates down with the full-text index instead of scanning every
+            # message when the query has whole words to look up; LIKE keeps the substring filter
+            phrases = _search_phrases(query)
+            if phrases and _has_message_search_index(cursor):
+                where_clauses.append("messages.rowid IN (SELECT docid FROM messages_fts WHERE messages_fts MATCH ?)")
+                params.append(phrases)
             where_clauses.append("LOWER(messages.content) LIKE LOWER(?)")
             params.append(f"%{query}%")
             
@@ -180,57 +353,77 @@ def list_messages(
             
         # Add pagination
         offset = page * limit
-        query_parts.append("ORDER BY messages.timestamp DESC")
+        query_parts.append("ORDER BY messages.timestamp DESC, messages.id DESC")
         query_parts.append("LIMIT ? OFFSET ?")
         params.extend([limit, offset])
         
         cursor.execute(" ".join(query_parts), tuple(params))
         messages = cursor.fetchall()
-        
-        result = []
-        for msg in messages:
-            message = Message(
-                timestamp=datetime.fromisoformat(msg[0]),
-                sender=msg[1],
-                chat_name=msg[2],
-                content=msg[3],
-                is_from_me=msg[4],
-                chat_jid=msg[5],
-                id=msg[6],
-                media_type=msg[7]
-            )
-            result.append(message)
-            
-        def message_to_dict(msg):
-            """Convert Message dataclass to dict with serializable datetime."""
-            msg_dict = asdict(msg)
-            msg_dict['timestamp'] = msg_dict['timestamp'].isoformat()
-            return msg_dict
 
-        if include_context and result:
+        if include_context and messages:
             # Add context for each message
             messages_with_context = []
             seen_ids = set()
-            for msg in result:
-                context = get_message_context(msg.id, context_before, context_after)
+            for msg in messages:
+                # Reuse this connection and the row already fetched rather than looking each message up again
+                context = _message_context(cursor, msg, context_before, context_after)
                 for m in context.before + [context.message] + context.after:
                     if m.id not in seen_ids:
-                        messages_with_context.append(message_to_dict(m))
+                        messages_with_context.append(_message_to_dict(m))
                         seen_ids.add(m.id)
 
             return messages_with_context
 
-        # Return messages as list of dictionaries
-        return [message_to_dict(msg) for msg in result]    
+        # Return messages as list of dictionaries, converting each row in a single pass
+        return [_message_to_dict(_message_from_row(msg)) for msg in messages]
         
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        print(f"Database error: {e}", file=sys.stderr)
         return []
     finally:
         if 'conn' in locals():
             conn.close()
 
 
+def _message_context(
+    cursor: sqlite3.Cursor,
+    msg_data: Tuple,
+    before: int,
+    after: int
+) -> MessageContext:
+    """Get context around a message row using an open database cursor."""
+    target_message = _message_from_row(msg_data)
+    
+    # Get messages before
+    cursor.execute("""
+        SELECT messages.timestamp, messages.sender, chats.name, messages.content, messages.is_from_me, chats.jid, messages.id, messages.media_type
+        FROM messages
+        JOIN chats ON messages.chat_jid = chats.jid
+        WHERE messages.chat_jid = ? AND messages.timestamp < ?
+        ORDER BY messages.timestamp DESC
+        LIMIT ?
+    """, (msg_data[5], msg_data[0], before))
+    
+    before_messages = [_message_from_row(msg) for msg in cursor.fetchall()]
+    
+    # Get messages after
+    cursor.execute("""
+        SELECT messages.timestamp, messages.sender, chats.name, messages.content, messages.is_from_me, chats.jid, messages.id, messages.media_type
+        FROM messages
+        JOIN chats ON messages.chat_jid = chats.jid
+        WHERE messages.chat_jid = ? AND messages.timestamp > ?
+        ORDER BY messages.timestamp ASC
+        LIMIT ?
+    """, (msg_data[5], msg_data[0], after))
+    
+    after_messages = [_message_from_row(msg) for msg in cursor.fetchall()]
+    
+    return MessageContext(
+        message=target_message,
+        before=before_messages,
+        after=after_messages
+    )
+
 def get_message_context(
     message_id: str,
     before: int = 5,
@@ -243,7 +436,7 @@ def get_message_context(
         
         # Get the target message first
         cursor.execute("""
-            SELECT messages.timestamp, messages.sender, chats.name, messages.content, messages.is_from_me, chats.jid, messages.id, messages.chat_jid, messages.media_type
+            SELECT messages.timestamp, messages.sender, chats.name, messages.content, messages.is_from_me, chats.jid, messages.id, messages.media_type
             FROM messages
             JOIN chats ON messages.chat_jid = chats.jid
             WHERE messages.id = ?
@@ -252,78 +445,19 @@ def get_message_context(
         
         if not msg_data:
             raise ValueError(f"Message with ID {message_id} not found")
-            
-        target_message = Message(
-            timestamp=datetime.fromisoformat(msg_data[0]),
-            sender=msg_data[1],
-            chat_name=msg_data[2],
-            content=msg_data[3],
-            is_from_me=msg_data[4],
-            chat_jid=msg_data[5],
-            id=msg_data[6],
-            media_type=msg_data[8]
-        )
-        
-        # Get messages before
-        cursor.execute("""
-            SELECT messages.timestamp, messages.sender, chats.name, messages.content, messages.is_from_me, chats.jid, messages.id, messages.media_type
-            FROM messages
-            JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.chat_jid = ? AND messages.timestamp < ?
-            ORDER BY messages.timestamp DESC
-            LIMIT ?
-        """, (msg_data[7], msg_data[0], before))
-        
-        before_messages = []
-        for msg in cursor.fetchall():
-            before_messages.append(Message(
-                timestamp=datetime.fromisoformat(msg[0]),
-                sender=msg[1],
-                chat_name=msg[2],
-                content=msg[3],
-                is_from_me=msg[4],
-                chat_jid=msg[5],
-                id=msg[6],
-                media_type=msg[7]
-            ))
-        
-        # Get messages after
-        cursor.execute("""
-            SELECT messages.timestamp, messages.sender, chats.name, messages.content, messages.is_from_me, chats.jid, messages.id, messages.media_type
-            FROM messages
-            JOIN chats ON messages.chat_jid = chats.jid
-            WHERE messages.chat_jid = ? AND messages.timestamp > ?
-            ORDER BY messages.timestamp ASC
-            LIMIT ?
-        """, (msg_data[7], msg_data[0], after))
         
-        after_messages = []
-        for msg in cursor.fetchall():
-            after_messages.append(Message(
-                timestamp=datetime.fromisoformat(msg[0]),
-                sender=msg[1],
-                chat_name=msg[2],
-                content=msg[3],
-                is_from_me=msg[4],
-                chat_jid=msg[5],
-                id=msg[6],
-                media_type=msg[7]
-            ))
-        
-        return MessageContext(
-            message=target_message,
-            before=before_messages,
-            after=after_messages
-        )
+        return _message_context(cursor, msg_data, before, after)
         
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        print(f"Database error: {e}", file=sys.stderr)
         raise
     finally:
         if 'conn' in locals():
             conn.close()
 
 
+# Chats change whenever a message arrives, so results are only reused briefly
+@_ttl_cache(ttl=5.0)
 def list_chats(
     query: Optional[str] = None,
     limit: int = 20,
@@ -341,9 +475,23 @@ def list_chats(
         conn = sqlite3.connect(MESSAGES_DB_PATH)
         cursor = conn.cursor()
 
-        # Use a subquery to get the actual last message for each chat
+        where_clauses = []
+        params = []
+
+        if query:
+            where_clauses.append("(LOWER(c.name) LIKE LOWER(?) OR c.jid LIKE ?)")
+            params.extend([f"%{query}%", f"%{query}%"])
+
+        where = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+
+        # Sort by the actual last message time
+        order_by = "last_msg_time DESC" if sort_by == "last_active" else "name"
+
+        # Use a subquery to get the actual last message time for each chat
         # This avoids the bug where chats.last_message_time is stale
-        base_query = """
+        # The requested page of chats is selected first, so the last messages
+        # are only looked up for the chats that are returned
+        base_query = f"""
             WITH last_messages AS (
                 SELECT
                     chat_jid,
@@ -351,47 +499,55 @@ def list_chats(
                 FROM messages
                 GROUP BY chat_jid
             ),
-            ranked_messages AS (
+            page AS (
                 SELECT
-                    m.chat_jid,
-                    m.content,
-                    m.sender,
-                    m.is_from_me,
-                    m.timestamp,
-                    ROW_NUMBER() OVER (PARTITION BY m.chat_jid ORDER BY m.timestamp DESC) as rn
-                FROM messages m
+                    c.jid,
+                    c.name,
+                    lm.last_msg_time
+                FROM chats c
+                INNER JOIN last_messages lm ON c.jid = lm.chat_jid
+                {where}
+                ORDER BY {order_by}
+                LIMIT ? OFFSET ?
             )
-            SELECT
-                c.jid,
-                c.name,
-                lm.last_msg_time as last_message_time,
-                rm.content as last_message,
-                rm.sender as last_sender,
-                rm.is_from_me as last_is_from_me
-            FROM chats c
-            INNER JOIN last_messages lm ON c.jid = lm.chat_jid
-            LEFT JOIN ranked_messages rm ON c.jid = rm.chat_jid AND rm.rn = 1
         """
 
-        where_clauses = []
-        params = []
-
-        if query:
-            where_clauses.append("(LOWER(c.name) LIKE LOWER(?) OR c.jid LIKE ?)")
-            params.extend([f"%{query}%", f"%{query}%"])
-
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
-
-        # Add sorting - use the actual last message time
-        order_by = "lm.last_msg_time DESC" if sort_by == "last_active" else "c.name"
-        base_query += f" ORDER BY {order_by}"
-
         # Add pagination
         offset = page * limit
-        base_query += " LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
+        if include_last_message:
+            base_query += f"""
+            SELECT
+                p.jid,
+                p.name,
+                p.last_msg_time as last_message_time,
+                m.content as last_message,
+                m.sender as last_sender,
+                m.is_from_me as last_is_from_me
+            FROM page p
+            LEFT JOIN messages m ON m.rowid = (
+                SELECT rowid
+                FROM messages
+                WHERE chat_jid = p.jid
+                ORDER BY timestamp DESC
+                LIMIT 1
+            )
+            ORDER BY {order_by}
+            """
+        else:
+            base_query += f"""
+            SELECT
+                jid,
+                name,
+                last_msg_time as last_message_time,
+                NULL as last_message,
+                NULL as last_sender,
+                NULL as last_is_from_me
+            FROM page
+            ORDER BY {order_by}
+            """
+
         cursor.execute(base_query, tuple(params))
         chats = cursor.fetchall()
 
@@ -414,13 +570,83 @@ def list_chats(
         return result
 
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        print(f"Database error: {e}", file=sys.stderr)
         return []
     finally:
         if 'conn' in locals():
             conn.close()
 
 
+def get_sync_checkpoints() -> List[SyncCheckpoint]:
+    """Get the history sync checkpoints of all chats whose sync page is still in progress.
+
+    All checkpoints are read in a single query; a chat only has a checkpoint while the
+    bridge is applying (or was interrupted applying) a history sync page for it.
+    """
+    try:
+        conn = sqlite3.connect(MESSAGES_DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT
+                sc.chat_jid,
+                c.name,
+                sc.page_cursor,
+                sc.last_applied_index,
+                sc.last_message_id,
+                sc.updated_at
+            FROM sync_checkpoints sc
+            LEFT JOIN chats c ON sc.chat_jid = c.jid
+            ORDER BY sc.updated_at DESC
+        """)
+
+        result = []
+        for checkpoint_data in cursor.fetchall():
+            checkpoint = SyncCheckpoint(
+                chat_jid=checkpoint_data[0],
+                chat_name=checkpoint_data[1],
+                page_cursor=checkpoint_data[2],
+                last_applied_index=checkpoint_data[3],
+                last_message_id=checkpoint_data[4],
+                updated_at=datetime.fromisoformat(checkpoint_data[5]) if checkpoint_data[5] else None
+            )
+            checkpoint_dict = asdict(checkpoint)
+            if checkpoint_dict['updated_at']:
+                checkpoint_dict['updated_at'] = checkpoint_dict['updated_at'].isoformat()
+            result.append(checkpoint_dict)
+
+        return result
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+        return []
+    finally:
+        if 'conn' in locals():
+            conn.close()
+
+
+def get_message_stats() -> Dict[str, int]:
+    """Get message statistics: total_messages, total_chats and media_<type> counts.
+
+    The bridge maintains these counters as messages are stored, so this reads a handful
+    of rows instead of scanning the messages table.
+    """
+    try:
+        conn = sqlite3.connect(MESSAGES_DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT key, value FROM message_stats")
+        return dict(cursor.fetchall())
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+        return {}
+    finally:
+        if 'conn' in locals():
+            conn.close()
+
+
+@_ttl_cache(ttl=30.0)
 def search_contacts(query: str) -> List[Contact]:
     """Search contacts by name or phone number."""
     try:
@@ -456,7 +682,7 @@ def search_contacts(query: str) -> List[Contact]:
         return result
         
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        print(f"Database error: {e}", file=sys.stderr)
         return []
     finally:
         if 'conn' in locals():
@@ -510,7 +736,7 @@ def get_contact_chats(jid: str, limit: int = 20, page: int = 0) -> List[Chat]:
         return result
 
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        print(f"Database error: {e}", file=sys.stderr)
         return []
     finally:
         if 'conn' in locals():
@@ -545,21 +771,12 @@ def get_last_interaction(jid: str) -> str:
         if not msg_data:
             return None
             
-        message = Message(
-            timestamp=datetime.fromisoformat(msg_data[0]),
-            sender=msg_data[1],
-            chat_name=msg_data[2],
-            content=msg_data[3],
-            is_from_me=msg_data[4],
-            chat_jid=msg_data[5],
-            id=msg_data[6],
-            media_type=msg_data[7]
-        )
+        message = _message_from_row(msg_data)
         
         return format_message(message)
         
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        print(f"Database error: {e}", file=sys.stderr)
         return None
     finally:
         if 'conn' in locals():
@@ -572,22 +789,31 @@ def get_chat(chat_jid: str, include_last_message: bool = True) -> Optional[Chat]
         conn = sqlite3.connect(MESSAGES_DB_PATH)
         cursor = conn.cursor()
         
-        query = """
-            SELECT 
-                c.jid,
-                c.name,
-                c.last_message_time,
-                m.content as last_message,
-                m.sender as last_sender,
-                m.is_from_me as last_is_from_me
-            FROM chats c
-        """
-        
         if include_last_message:
-            query += """
+            query = """
+                SELECT 
+                    c.jid,
+                    c.name,
+                    c.last_message_time,
+                    m.content as last_message,
+                    m.sender as last_sender,
+                    m.is_from_me as last_is_from_me
+                FROM chats c
                 LEFT JOIN messages m ON c.jid = m.chat_jid 
                 AND c.last_message_time = m.timestamp
             """
+        else:
+            # Without the join there is no "m" to select from
+            query = """
+                SELECT 
+                    c.jid,
+                    c.name,
+                    c.last_message_time,
+                    NULL as last_message,
+                    NULL as last_sender,
+                    NULL as last_is_from_me
+                FROM chats c
+            """
             
         query += " WHERE c.jid = ?"
         
@@ -611,7 +837,7 @@ def get_chat(chat_jid: str, include_last_message: bool = True) -> Optional[Chat]
         return chat_dict
 
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        print(f"Database error: {e}", file=sys.stderr)
         return None
     finally:
         if 'conn' in locals():
@@ -658,113 +884,135 @@ def get_direct_chat_by_contact(sender_phone_number: str) -> Optional[Chat]:
         return chat_dict
 
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        print(f"Database error: {e}", file=sys.stderr)
         return None
     finally:
         if 'conn' in locals():
             conn.close()
 
-def send_message(recipient: str, message: str) -> Tuple[bool, str]:
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+def _client() -> httpx.Client:
+    """Return the HTTP client shared by all bridge calls.
+
+    Keeping the connection to the bridge alive saves a TCP handshake on every tool call.
+    When WHATSAPP_BRIDGE_SOCKET is set the bridge is reached over its Unix socket instead.
+    """
+    global _http_client
+    # The warm-up thread and the first tool call may get here at the same time
+    with _http_client_lock:
+        if _http_client is None:
+            transport = httpx.HTTPTransport(uds=_BRIDGE_SOCKET) if _BRIDGE_SOCKET else None
+            # No timeout: sending media waits for the bridge to upload it to WhatsApp
+            _http_client = httpx.Client(transport=transport, headers=_JSON_HEADERS, timeout=None)
+        return _http_client
+
+def _post(url: str, payload: dict) -> httpx.Response:
+    """POST a JSON payload to a WhatsApp bridge API endpoint."""
+    return _client().post(url, content=json.dumps(payload))
+
+def _send(payload: dict) -> Tuple[bool, str]:
+    """Send a message through the bridge and return its success status and status message."""
     try:
-        # Validate input
-        if not recipient:
-            return False, "Recipient must be provided"
-        
-        url = f"{WHATSAPP_API_BASE_URL}/send"
-        payload = {
-            "recipient": recipient,
-            "message": message,
-        }
-        
-        response = requests.post(url, json=payload)
+        response = _post(_SEND_URL, payload)
         
         # Check if the request was successful
         if response.status_code == 200:
             result = response.json()
+            if result.get("success", False):
+                # The sent message is now the last one of its chat
+                list_chats.cache_clear()
             return result.get("success", False), result.get("message", "Unknown response")
         else:
             return False, f"Error: HTTP {response.status_code} - {response.text}"
             
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         return False, f"Request error: {str(e)}"
     except json.JSONDecodeError:
         return False, f"Error parsing response: {response.text}"
     except Exception as e:
         return False, f"Unexpected error: {str(e)}"
 
+def _recipient_error(recipient: str) -> Optional[str]:
+    """Check a recipient locally, returning why it is invalid or None if it looks valid.
+
+    Malformed recipients would otherwise only fail in the bridge, after a round-trip.
+    """
+    if not recipient:
+        return "Recipient must be provided"
+
+    if "@" in recipient:
+        user, _, server = recipient.partition("@")
+        if not user or server not in _JID_SERVERS:
+            return f"Invalid recipient JID: {recipient}"
+    elif not recipient.isdigit():
+        return f"Invalid recipient phone number: {recipient}. Use the country code and number, digits only"
+
+    return None
+
+def send_message(recipient: str, message: str) -> Tuple[bool, str]:
+    # Validate input
+    error = _recipient_error(recipient)
+    if error:
+        return False, error
+    
+    return _send({
+        "recipient": recipient,
+        "message": message,
+    })
+
 def send_file(recipient: str, media_path: str) -> Tuple[bool, str]:
-    try:
-        # Validate input
-        if not recipient:
-            return False, "Recipient must be provided"
-        
-        if not media_path:
-            return False, "Media path must be provided"
-        
-        if not os.path.isfile(media_path):
-            return False, f"Media file not found: {media_path}"
-        
-        url = f"{WHATSAPP_API_BASE_URL}/send"
-        payload = {
-            "recipient": recipient,
-            "media_path": media_path
-        }
-        
-        response = requests.post(url, json=payload)
-        
-        # Check if the request was successful
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("success", False), result.get("message", "Unknown response")
-        else:
-            return False, f"Error: HTTP {response.status_code} - {response.text}"
-            
-    except requests.RequestException as e:
-        return False, f"Request error: {str(e)}"
-    except json.JSONDecodeError:
-        return False, f"Error parsing response: {response.text}"
-    except Exception as e:
-        return False, f"Unexpected error: {str(e)}"
+    # Validate input
+    error = _recipient_error(recipient)
+    if error:
+        return False, error
+    
+    if not media_path:
+        return False, "Media path must be provided"
+    
+    if not os.path.isfile(media_path):
+        return False, f"Media file not found: {media_path}"
+    
+    return _send({
+        "recipient": recipient,
+        "media_path": media_path
+    })
 
 def send_audio_message(recipient: str, media_path: str) -> Tuple[bool, str]:
-    try:
-        # Validate input
-        if not recipient:
-            return False, "Recipient must be provided"
-        
-        if not media_path:
-            return False, "Media path must be provided"
-        
-        if not os.path.isfile(media_path):
-            return False, f"Media file not found: {media_path}"
+    # Validate input
+    error = _recipient_error(recipient)
+    if error:
+        return False, error
+    
+    if not media_path:
+        return False, "Media path must be provided"
+    
+    if not os.path.isfile(media_path):
+        return False, f"Media file not found: {media_path}"
 
-        if not media_path.endswith(".ogg"):
-            try:
-                media_path = audio.convert_to_opus_ogg_temp(media_path)
-            except Exception as e:
-                return False, f"Error converting file to opus ogg. You likely need to install ffmpeg: {str(e)}"
-        
-        url = f"{WHATSAPP_API_BASE_URL}/send"
-        payload = {
-            "recipient": recipient,
-            "media_path": media_path
-        }
-        
-        response = requests.post(url, json=payload)
-        
-        # Check if the request was successful
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("success", False), result.get("message", "Unknown response")
-        else:
-            return False, f"Error: HTTP {response.status_code} - {response.text}"
-            
-    except requests.RequestException as e:
-        return False, f"Request error: {str(e)}"
-    except json.JSONDecodeError:
-        return False, f"Error parsing response: {response.text}"
-    except Exception as e:
-        return False, f"Unexpected error: {str(e)}"
+    if not media_path.endswith(".ogg"):
+        try:
+            media_path = audio.convert_to_opus_ogg_temp(media_path)
+        except Exception as e:
+            return False, f"Error converting file to opus ogg. You likely need to install ffmpeg: {str(e)}"
+    
+    return _send({
+        "recipient": recipient,
+        "media_path": media_path
+    })
+
+def warm_up() -> None:
+    """Pay one-time costs ahead of the first tool calls.
+
+    Listing the chats loads the database pages it reads into the OS cache (and caches the
+    default chat list), and the bridge client is created.
+    """
+    if os.path.exists(MESSAGES_DB_PATH):
+        list_chats()
+    _client()
 
 def download_media(message_id: str, chat_jid: str) -> Optional[str]:
     """Download media from a message and return the local file path.
@@ -777,33 +1025,30 @@ def download_media(message_id: str, chat_jid: str) -> Optional[str]:
         The local file path if download was successful, None otherwise
     """
     try:
-        url = f"{WHATSAPP_API_BASE_URL}/download"
-        payload = {
+        response = _post(_DOWNLOAD_URL, {
             "message_id": message_id,
             "chat_jid": chat_jid
-        }
-        
-        response = requests.post(url, json=payload)
+        })
         
         if response.status_code == 200:
             result = response.json()
             if result.get("success", False):
                 path = result.get("path")
-                print(f"Media downloaded successfully: {path}")
+                print(f"Media downloaded successfully: {path}", file=sys.stderr)
                 return path
             else:
-                print(f"Download failed: {result.get('message', 'Unknown error')}")
+                print(f"Download failed: {result.get('message', 'Unknown error')}", file=sys.stderr)
                 return None
         else:
-            print(f"Error: HTTP {response.status_code} - {response.text}")
+            print(f"Error: HTTP {response.status_code} - {response.text}", file=sys.stderr)
             return None
             
-    except requests.RequestException as e:
-        print(f"Request error: {str(e)}")
+    except httpx.HTTPError as e:
+        print(f"Request error: {str(e)}", file=sys.stderr)
         return None
     except json.JSONDecodeError:
-        print(f"Error parsing response: {response.text}")
+        print(f"Error parsing response: {response.text}", file=sys.stderr)
         return None
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        print(f"Unexpected error: {str(e)}", file=sys.stderr)
         return None